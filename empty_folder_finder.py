@@ -16,14 +16,15 @@ Operational Workflow:
       to maintain GUI responsiveness.
   4.  A progress window is displayed, showing detailed status updates and a
       progress bar. The user can close this window to gracefully cancel the scan.
-  5.  The worker thread first executes a pre-scan to enumerate all subdirectories,
-      enabling an accurate progress meter.
-  6.  It then performs the main recursive scan, checking a cancellation flag between
-      directory operations to ensure prompt termination if requested.
+  5.  The worker thread walks the tree in a single pass using `os.scandir`, growing
+      the progress meter's total as new subdirectories are discovered.
+  6.  A cancellation flag is checked after every batch of 512 directories; the
+      scan stops at the next such check once cancellation is requested.
   7.  A folder's path is collected if it contains no subdirectories and no files,
       or only files designated as ignorable.
-  8.  Upon completion or cancellation, the progress window is closed, and the
-      results are populated in the main listbox.
+  8.  Empty folders are streamed into the main listbox in batches as they are
+      found. Upon completion or cancellation, the progress window is closed and
+      the results found so far are sorted.
   9.  The user can select single or multiple folders from the results list. Native
       macOS key bindings (Command-Click) are supported for multi-selection.
  10. A status panel provides detailed information for the selected folder, including
@@ -32,7 +33,8 @@ Operational Workflow:
      a confirmation prompt, move the selected items to the system Trash.
  12. A final summary report, presented in a read-only but copyable window,
      details the outcome of the move operation. This report is also logged to the
-     console.
+     console. Moved folders are removed from the results list; the "Refresh"
+     button re-scans the current directory on demand.
 
 Usage:
     - Ensure required libraries are installed:
@@ -54,24 +56,36 @@ import sys
 import threading
 import queue
 
-# A list of system files/folders to ignore when determining if a directory is empty.
-IGNORED_ITEMS = ['.DS_Store', 'Thumbs.db', 'desktop.ini']
+# A set of system files/folders to ignore when determining if a directory is empty.
+IGNORED_ITEMS = frozenset({'.DS_Store', 'Thumbs.db', 'desktop.ini'})
 
-def get_folder_size(folder_path):
-    """Calculates the total size of all files within a directory tree."""
-    total_size = 0
-    try:
-        for dirpath, _, filenames in os.walk(folder_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if not os.path.islink(fp):
-                    try:
-                        total_size += os.path.getsize(fp)
-                    except OSError:
-                        pass
-    except OSError:
-        pass
-    return total_size
+# Folders that are never descended into when the "skip" option is enabled. They still
+# count as content, so their parent folder is never reported as empty.
+PRUNED_DIRS = frozenset({'.git', '.hg', '.svn', 'node_modules'})
+
+# Queue polling intervals (ms) for the progress window: fast while the worker is
+# reporting, slower after a run of empty polls.
+QUEUE_POLL_ACTIVE_MS = 20
+QUEUE_POLL_IDLE_MS = 250
+QUEUE_IDLE_POLLS_BEFORE_BACKOFF = 5
+
+# Details captured by the scan for each empty folder in the listbox, keyed by its
+# listed path: (size of its ignored files, names of its ignored files).
+_folder_info = {}
+
+def _dir_prefix(dirpath):
+    """Returns `dirpath` with a trailing separator, so child paths are built by plain concatenation."""
+    # Called once per directory rather than os.path.join once per child. os.path.join also
+    # recognises roots that already end in either separator, e.g. 'C:/' from the file dialog.
+    return os.path.join(dirpath, '')
+
+def is_still_empty(folder_path):
+    """
+    Returns True if the folder contains nothing but ignored items, stopping at the first real entry.
+    Raises OSError if the folder cannot be read, so callers can report the actual error.
+    """
+    with os.scandir(folder_path) as it:
+        return not any(entry.name not in IGNORED_ITEMS for entry in it)
 
 def format_size(size_in_bytes):
     """Converts a size in bytes to a human-readable string (KB, MB, GB)."""
@@ -92,53 +106,127 @@ def select_directory():
         entry_path.insert(0, folder_selected)
         start_scan_thread(folder_selected)
 
-def scan_thread_worker(folder_path, q, cancel_event):
+def refresh_scan():
+    """GUI callback to re-scan the current directory from scratch."""
+    current_search_path = entry_path.get()
+    if current_search_path:
+        start_scan_thread(current_search_path)
+    else:
+        messagebox.showwarning("Warning", "Please select a directory to scan.")
+
+def _list_dir(dirpath):
+    """
+    Lists a single directory, returning `(dirnames, filenames, ignored_size)` or None
+    if it cannot be read. Symlinks are listed as files. `ignored_size` is the total
+    size of the files named in IGNORED_ITEMS, not counting symlinks.
+    """
+    dirnames = []
+    filenames = []
+    ignored_size = 0
+    try:
+        with os.scandir(dirpath) as it:
+            # DirEntry type checks come from the directory listing itself,
+            # so no extra stat call is made per entry.
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    dirnames.append(entry.name)
+                else:
+                    filenames.append(entry.name)
+                    if entry.name in IGNORED_ITEMS and not entry.is_symlink():
+                        try:
+                            # Cached on the DirEntry; on Windows it comes free with the listing.
+                            ignored_size += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            pass
+    except OSError:
+        return None
+    return dirnames, filenames, ignored_size
+
+def _walk(top):
+    """
+    A lean, top-down variant of `os.walk` built directly on `os.scandir`.
+
+    Yields `(dirpath, dirnames, filenames, ignored_size)`, the `os.walk` triple plus
+    the size of the directory's ignored files (see `_list_dir`); the caller may prune
+    `dirnames` in place to skip subtrees. Symlinks are listed as files and never
+    followed, and unreadable directories are silently skipped.
+    """
+    stack = [top]
+    while stack:
+        dirpath = stack.pop()
+        listing = _list_dir(dirpath)
+        if listing is None:
+            continue
+        dirnames, filenames, ignored_size = listing
+
+        yield dirpath, dirnames, filenames, ignored_size
+
+        # Join the parent path once instead of calling os.path.join per child.
+        prefix = _dir_prefix(dirpath)
+        stack.extend(prefix + d for d in reversed(dirnames))
+
+def scan_thread_worker(folder_path, q, cancel_event, prune_dirs=frozenset()):
     """
     The worker function that scans for empty folders in a separate thread.
-    It can be stopped early via the `cancel_event`.
+    It can be stopped early via the `cancel_event`. Subdirectories whose name is
+    in `prune_dirs` are not scanned. Empty folders are streamed to the GUI in
+    batches of `(path, size, ignored_names)` as they are found.
     """
     try:
-        # 1. Pre-scan to count directories for the progress bar
-        q.put(('status', 'Pre-scanning to count items...'))
-        total_dirs = 0
-        for _, dirs, _ in os.walk(folder_path):
-            if cancel_event.is_set():
-                print("\nScan cancelled during pre-scan.")
-                q.put(('cancelled', None))
-                return
-            total_dirs += len(dirs)
-        q.put(('max', total_dirs))
-        
-        # 2. Main scan to find empty folders
-        empty_folders = []
+        # Single-pass scan. The total is an estimate that grows as new
+        # subdirectories are discovered, so no separate counting pass is needed.
+        q.put(('status', 'Scanning...'))
+        found_batch = []
+        found_count = 0
         processed_dirs = 0
-        for root, dirs, files in os.walk(folder_path, topdown=False):
-            if cancel_event.is_set():
-                print("\nScan cancelled by user.")
-                q.put(('cancelled', None))
-                return
-
+        total_dirs = 1
+        # The GUI already shows progress; only echo it to an interactive console.
+        # sys.stdout is None under pythonw.
+        print_progress = sys.stdout is not None and sys.stdout.isatty()
+        is_cancelled = cancel_event.is_set
+        for dirpath, dirnames, filenames, ignored_size in _walk(folder_path):
             processed_dirs += 1
-            non_ignored_files = [f for f in files if f not in IGNORED_ITEMS]
-            
-            if not dirs and not non_ignored_files:
-                empty_folders.append(root)
-
-            if processed_dirs % 500 == 0: # Update less frequently to improve performance
-                q.put(('progress', processed_dirs))
-                q.put(('status', f'Scanning:\n{root}'))
-                print(f"[{processed_dirs}/{total_dirs}] Scanning: {root}", end='\r', flush=True)
-
-        print(f"\nScan complete. Found {len(empty_folders)} empty folders.")
-        q.put(('done', empty_folders))
+            if not dirnames and not any(f not in IGNORED_ITEMS for f in filenames):
+                # Record the size and ignored items for the status panel now, so selecting
+                # the row later doesn't re-list or re-size it.
+                found_batch.append((dirpath, ignored_size, filenames))
+
+            if prune_dirs:
+                dirnames[:] = [d for d in dirnames if d not in prune_dirs]
+            total_dirs += len(dirnames)
+
+            # Every 512 directories: check for cancellation and report progress. Checking once
+            # per batch saves a method call per directory; a cancel request is therefore only
+            # acknowledged at the next multiple of 512 processed directories.
+            if processed_dirs & 0x1FF == 0:
+                if is_cancelled():
+                    print("\nScan cancelled by user.")
+                    q.put(('cancelled', None))
+                    return
+                # One combined message per update keeps cross-thread handoffs to a minimum.
+                if found_batch:
+                    q.put(('found', found_batch))
+                    found_count += len(found_batch)
+                    found_batch = []
+                q.put(('tick', (processed_dirs, total_dirs, dirpath)))
+                if print_progress and processed_dirs & 0x1FFF == 0:
+                    print(f"[{processed_dirs}/{total_dirs}] Scanning: {dirpath}", end='\r', flush=True)
+
+        if found_batch:
+            q.put(('found', found_batch))
+            found_count += len(found_batch)
+        print(f"\nScan complete. Found {found_count} empty folders.")
+        q.put(('done', found_count))
     except Exception as e:
         q.put(('error', str(e)))
 
 def start_scan_thread(folder_path):
     """Initializes and starts the folder scanning thread and progress window."""
     listbox_empty_folders.delete(0, tk.END)
+    _folder_info.clear()
     label_status.config(text="Searching for empty folders...", fg="blue")
     button_browse.config(state=tk.DISABLED)
+    button_refresh.config(state=tk.DISABLED)
 
     progress_win = tk.Toplevel(root)
     progress_win.title("Scanning...")
@@ -149,7 +237,8 @@ def start_scan_thread(folder_path):
     status_label = tk.Label(progress_win, text="Initializing scan...", justify=tk.LEFT, anchor="w")
     status_label.pack(pady=10, padx=10, fill=tk.X)
     
-    progress_bar = ttk.Progressbar(progress_win, orient='horizontal', mode='determinate')
+    # The maximum is an estimate that the worker raises as it discovers subdirectories.
+    progress_bar = ttk.Progressbar(progress_win, orient='horizontal', mode='determinate', maximum=1)
     progress_bar.pack(pady=10, padx=10, fill=tk.X, expand=True)
     
     q = queue.Queue()
@@ -159,35 +248,55 @@ def start_scan_thread(folder_path):
         """Function called when the progress window is closed."""
         cancel_event.set()  # Signal the thread to stop
         progress_win.destroy()
-        label_status.config(text="Scan cancelled by user.")
-        button_browse.config(state=tk.NORMAL)
+        # Keep the folders found so far, including batches not yet picked up by process_queue.
+        try:
+            while True:
+                msg_type, value = q.get_nowait()
+                if msg_type == 'found':
+                    add_found_folders(value)
+        except queue.Empty:
+            pass
+        populate_results_in_listbox(listbox_empty_folders.get(0, tk.END))
+        label_status.config(text=f"Scan cancelled by user. Found {listbox_empty_folders.size()} empty folders so far.")
         
     # Intercept the window close ('X') button
     progress_win.protocol("WM_DELETE_WINDOW", on_cancel_scan)
 
-    thread = threading.Thread(target=scan_thread_worker, args=(folder_path, q, cancel_event))
+    prune_dirs = PRUNED_DIRS if skip_pruned_dirs.get() else frozenset()
+    thread = threading.Thread(target=scan_thread_worker, args=(folder_path, q, cancel_event, prune_dirs))
     thread.daemon = True
     thread.start()
     
     process_queue(q, progress_bar, status_label, progress_win, cancel_event)
 
-def process_queue(q, progress_bar, status_label, progress_win, cancel_event):
-    """Periodically checks the queue for messages from the worker thread."""
+def process_queue(q, progress_bar, status_label, progress_win, cancel_event, idle_polls=0):
+    """
+    Periodically drains the queue of messages from the worker thread.
+    Polls quickly while messages are flowing and backs off once the queue stays empty.
+    """
     # If the cancel event was set by the user, stop processing the queue
     if cancel_event.is_set():
         return
 
-    try:
-        msg_type, value = q.get_nowait()
-        if msg_type == 'max':
-            progress_bar['maximum'] = value if value > 0 else 1
-        elif msg_type == 'progress':
-            progress_bar['value'] = value
+    received = False
+    latest_tick = None
+    while True:
+        try:
+            msg_type, value = q.get_nowait()
+        except queue.Empty:
+            break
+        received = True
+        if msg_type == 'tick':
+            # Only the newest progress matters; widgets are updated once per drain.
+            latest_tick = value
+        elif msg_type == 'found':
+            add_found_folders(value)
         elif msg_type == 'status':
             status_label.config(text=value)
         elif msg_type == 'done':
             progress_win.destroy()
-            populate_results_in_listbox(value)
+            # Re-insert the streamed results in sorted order.
+            populate_results_in_listbox(listbox_empty_folders.get(0, tk.END))
             return
         elif msg_type == 'cancelled':
             # The worker acknowledged the cancellation, so we can stop.
@@ -197,22 +306,37 @@ def process_queue(q, progress_bar, status_label, progress_win, cancel_event):
             messagebox.showerror("Error", f"An error occurred during scanning:\n{value}")
             populate_results_in_listbox([])
             return
-    except queue.Empty:
-        pass
-    finally:
-        root.after(100, process_queue, q, progress_bar, status_label, progress_win, cancel_event)
+
+    if latest_tick is not None:
+        processed_dirs, total_dirs, current_dir = latest_tick
+        # The total is a running estimate; never let it fall below the processed count.
+        progress_bar['maximum'] = max(total_dirs, processed_dirs, 1)
+        progress_bar['value'] = processed_dirs
+        status_label.config(text=f'Scanning:\n{current_dir}')
+
+    idle_polls = 0 if received else idle_polls + 1
+    delay = QUEUE_POLL_IDLE_MS if idle_polls >= QUEUE_IDLE_POLLS_BEFORE_BACKOFF else QUEUE_POLL_ACTIVE_MS
+    root.after(delay, process_queue, q, progress_bar, status_label, progress_win, cancel_event, idle_polls)
+
+def add_found_folders(batch):
+    """Appends a batch of `(path, size, ignored_names)` scan results to the listbox."""
+    for folder_path, size, ignored in batch:
+        _folder_info[folder_path] = (size, ignored)
+    # A single Tcl call per batch rather than one per folder.
+    listbox_empty_folders.insert(tk.END, *[folder_path for folder_path, _, _ in batch])
 
 def populate_results_in_listbox(empty_folders):
     """Populates the listbox with scan results and re-enables UI elements."""
     listbox_empty_folders.delete(0, tk.END)
     if empty_folders:
-        for folder in sorted(empty_folders):
-            listbox_empty_folders.insert(tk.END, folder)
+        # Sort once and insert everything in a single Tcl call.
+        listbox_empty_folders.insert(tk.END, *sorted(empty_folders))
         label_status.config(text=f"Found {len(empty_folders)} empty folders.", fg="black")
     else:
         label_status.config(text="No empty folders found.", fg="black")
     
     button_browse.config(state=tk.NORMAL)
+    button_refresh.config(state=tk.NORMAL)
 
 def open_selected_folder():
     """GUI callback to open the selected folder in the native file manager."""
@@ -304,12 +428,10 @@ def move_selected_to_trash():
                 if not os.path.exists(folder_path):
                     raise FileNotFoundError("Folder not found (already moved or deleted).")
                 
-                current_contents = os.listdir(folder_path)
-                non_ignored_contents = [item for item in current_contents if item not in IGNORED_ITEMS]
-
-                if not non_ignored_contents:
+                if is_still_empty(folder_path):
                     send2trash.send2trash(folder_path)
                     successful_moves.append(folder_path)
+                    _folder_info.pop(folder_path, None)
                 else:
                     # The folder is no longer empty
                     failed_moves.append((folder_path, "No longer empty."))
@@ -347,10 +469,30 @@ def move_selected_to_trash():
         # Show the summary in a dedicated, read-only window
         show_summary_report_window(final_summary_text)
 
-        # Refresh the main listbox to reflect the changes
-        current_search_path = entry_path.get()
-        if current_search_path:
-            start_scan_thread(current_search_path)
+        # Drop the moved folders from the listbox instead of re-scanning the whole tree
+        remove_folders_from_listbox(set(successful_moves))
+
+
+def remove_folders_from_listbox(folder_paths):
+    """Removes the given folders from the results list and updates the status line."""
+    if not folder_paths:
+        return
+    # Fetch all rows in one Tcl call, then delete only the matching rows (from the end,
+    # so earlier indices stay valid). This keeps the scroll position and selection.
+    items = listbox_empty_folders.get(0, tk.END)
+    for index in reversed(range(len(items))):
+        if items[index] in folder_paths:
+            listbox_empty_folders.delete(index)
+
+    label_folder_status.config(state=tk.NORMAL)
+    label_folder_status.delete('1.0', tk.END)
+    label_folder_status.config(state=tk.DISABLED)
+
+    remaining = listbox_empty_folders.size()
+    if remaining:
+        label_status.config(text=f"Found {remaining} empty folders.", fg="black")
+    else:
+        label_status.config(text="No empty folders found.", fg="black")
 
 
 def on_folder_select(event):
@@ -361,18 +503,22 @@ def on_folder_select(event):
 
     if selected_indices:
         selected_folder_path = listbox_empty_folders.get(selected_indices[0])
-        folder_size_formatted = format_size(get_folder_size(selected_folder_path))
 
         try:
             if os.path.exists(selected_folder_path):
-                contents = os.listdir(selected_folder_path)
-                non_ignored = [item for item in contents if item not in IGNORED_ITEMS]
-                ignored = [item for item in contents if item in IGNORED_ITEMS]
+                # Size and ignored items were captured during the scan; only re-check
+                # (with an early-exit probe) that the folder is still empty.
+                size, ignored = _folder_info[selected_folder_path]
+                is_empty = is_still_empty(selected_folder_path)
                 label_folder_status.insert(tk.END, f"Folder:\n{selected_folder_path}\n\n")
-                label_folder_status.insert(tk.END, "Status: EMPTY\n" if not non_ignored else "Status: NOT EMPTY!\n", "green" if not non_ignored else "red")
-                label_folder_status.insert(tk.END, f"Size: {folder_size_formatted}")
-                if ignored:
-                    label_folder_status.insert(tk.END, f"\n\nContains ignored items: {', '.join(ignored)}", "orange")
+                if is_empty:
+                    label_folder_status.insert(tk.END, "Status: EMPTY\n", "green")
+                    label_folder_status.insert(tk.END, f"Size: {format_size(size)}")
+                    if ignored:
+                        label_folder_status.insert(tk.END, f"\n\nContains ignored items: {', '.join(ignored)}", "orange")
+                else:
+                    # The scan-time size and ignored items no longer describe this folder.
+                    label_folder_status.insert(tk.END, "Status: NOT EMPTY!\n", "red")
             else:
                 label_folder_status.insert(tk.END, "Status: Not found.", "gray")
         except Exception as e:
@@ -403,6 +549,8 @@ if __name__ == "__main__":
     entry_path.pack(side=tk.LEFT, padx=5, expand=True, fill=tk.X)
     button_browse = tk.Button(frame_select_dir, text="Browse...", command=select_directory)
     button_browse.pack(side=tk.LEFT)
+    button_refresh = tk.Button(frame_select_dir, text="Refresh", command=refresh_scan)
+    button_refresh.pack(side=tk.LEFT, padx=(5, 0))
 
     frame_list = tk.Frame(main_frame)
     frame_list.grid(row=1, column=0, sticky="nsew")
@@ -438,6 +586,14 @@ if __name__ == "__main__":
     button_trash = tk.Button(frame_actions, text="Move to Trash", command=move_selected_to_trash)
     button_trash.pack(side=tk.LEFT, padx=(5, 0), expand=True, fill=tk.X)
 
+    skip_pruned_dirs = tk.BooleanVar(value=True)
+    check_skip_pruned = tk.Checkbutton(
+        main_frame,
+        text=f"Skip {', '.join(sorted(PRUNED_DIRS))} folders",
+        variable=skip_pruned_dirs
+    )
+    check_skip_pruned.grid(row=3, column=0, columnspan=2, pady=(5, 0), sticky="w")
+
     frame_preview = tk.LabelFrame(main_frame, text="Selected Folder Status")
     frame_preview.grid(row=1, column=1, sticky="nsew", padx=(10, 0), rowspan=2)
     label_folder_status = tk.Text(frame_preview, wrap=tk.WORD, height=10, width=40, padx=5, pady=5)